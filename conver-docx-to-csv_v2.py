@@ -11,115 +11,242 @@ import csv
 import json
 import argparse
 import unicodedata
+import zipfile
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple
-from docx import Document
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from lxml import etree
 
-HTTP_METHODS = {"GET","POST","PUT","PATCH","DELETE","OPTIONS","HEAD"}
+try:  # opcional: serializador JSON en C, mucho más rápido que json.dump
+    import orjson
+except ImportError:
+    orjson = None
+
+HTTP_METHODS = frozenset({"GET","POST","PUT","PATCH","DELETE","OPTIONS","HEAD"})
 SPANISH_MONTHS = {
     "enero":1,"febrero":2,"marzo":3,"abril":4,"mayo":5,"junio":6,
     "julio":7,"agosto":8,"septiembre":9,"setiembre":9,"octubre":10,
     "noviembre":11,"diciembre":12
 }
+# Prefijo de 3 letras -> mes ("sep" y "set" -> 9)
+_MONTH_PREFIX = {k[:3]: v for k, v in SPANISH_MONTHS.items()}
+
+# Patrones precompilados (se compilan una sola vez por proceso)
+_EH_RE = re.compile(r'\bEH-[A-Z0-9]{2,}-\d{5}\b', re.IGNORECASE)
+_DATE_LONG_RE = re.compile(r'(\d{1,2})\s+de\s+([a-z]+)\s+de\s+(\d{4})')
+_DATE_SHORT_RE = re.compile(r'(\d{1,2})[-/ ]([a-z]{3,})[-/ ](\d{4})')
+_NONDIGIT_RE = re.compile(r'\D')
+_SEV_RE = re.compile(r'CR[IÍ]TICA|ALTA|MEDIA|BAJA')  # se aplica sobre texto en mayúsculas
+_WS_RE = re.compile(r'\s+')  # en patrones str, \s incluye \xa0
 
 # ---------------- Utilitarios ----------------
+@lru_cache(maxsize=8192)
 def _norm(s: str) -> str:
-    if s is None: return ""
+    if not s: return ""
     s = s.replace("\xa0"," ").strip()
+    if s.isascii(): return s.lower()  # sin acentos: NFKD no cambiaría nada
     s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
     return s.lower()
 
 def _clean(s: str) -> str:
-    return " ".join((s or "").replace("\xa0"," ").split())
+    return _WS_RE.sub(" ", s).strip() if s else ""
 
+@lru_cache(maxsize=1024)
 def parse_spanish_date(text: str) -> str:
     """'03 de diciembre de 2024' -> '03/12/2024' (maneja también 02-dic-2024)."""
     if not text: return ""
     t = _norm(text)
-    m = re.search(r'(\d{1,2})\s+de\s+([a-z]+)\s+de\s+(\d{4})', t)
+    m = _DATE_LONG_RE.search(t)
     if not m:
-        m = re.search(r'(\d{1,2})[-/ ]([a-z]{3,})[-/ ](\d{4})', t)
+        m = _DATE_SHORT_RE.search(t)
         if not m: return ""
     day, mon_txt, year = m.group(1), m.group(2), m.group(3)
     mon_txt = mon_txt.strip(".").lower()
-    month = None
-    for k in list(SPANISH_MONTHS.keys()):
-        if mon_txt.startswith(k[:3]):
-            month = SPANISH_MONTHS[k]; break
-    if not month: month = SPANISH_MONTHS.get(mon_txt)
+    month = _MONTH_PREFIX.get(mon_txt[:3]) or SPANISH_MONTHS.get(mon_txt)
     if not month: return ""
     try:
         return datetime(int(year), int(month), int(day)).strftime("%d/%m/%Y")
     except Exception:
         return ""
 
+# ---------------- Lectura del .docx ----------------
+# Se lee word/document.xml directamente del zip con lxml.etree.iterparse, sin
+# construir el modelo de python-docx (estilos, numeración, objetos _Row/_Cell...).
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_TBL = _W + "body", _W + "p", _W + "tbl"
+_W_NS = {"w": _W[1:-1]}
+_XP_TR = etree.XPath("./w:tr", namespaces=_W_NS)
+_XP_TC = etree.XPath("./w:tc", namespaces=_W_NS)
+_XP_P = etree.XPath("./w:p", namespaces=_W_NS)
+_XP_RUNS = etree.XPath("./w:r | ./w:hyperlink/w:r", namespaces=_W_NS)
+_XP_RUN_CONTENT = etree.XPath(
+    "./w:br | ./w:cr | ./w:noBreakHyphen | ./w:ptab | ./w:t | ./w:tab", namespaces=_W_NS
+)
+_XP_GRID_BEFORE = etree.XPath("./w:trPr/w:gridBefore/@w:val", namespaces=_W_NS)
+_XP_GRID_SPAN = etree.XPath("./w:tcPr/w:gridSpan/@w:val", namespaces=_W_NS)
+_XP_VMERGE = etree.XPath("./w:tcPr/w:vMerge", namespaces=_W_NS)
+_W_T, _W_BR = _W + "t", _W + "br"
+_RUN_CHARS = {_W + "cr": "\n", _W + "noBreakHyphen": "-", _W + "ptab": "\t", _W + "tab": "\t"}
+
+Table = List[List[str]]  # filas -> textos de celda
+
+def _run_text(r) -> str:
+    # Igual que Run.text: tabulaciones, saltos y guiones de no separación cuentan como texto
+    out = []
+    for e in _XP_RUN_CONTENT(r):
+        if e.tag == _W_T:
+            out.append(e.text or "")
+        elif e.tag == _W_BR:
+            # solo el salto de línea es texto; los de página/columna no
+            out.append("\n" if e.get(_W + "type", "textWrapping") == "textWrapping" else "")
+        else:
+            out.append(_RUN_CHARS[e.tag])
+    return "".join(out)
+
+def _p_text(p) -> str:
+    # Igual que Paragraph.text: runs directos y los de hipervínculos
+    return "".join(_run_text(r) for r in _XP_RUNS(p))
+
+def _cell_text(tc) -> str:
+    # Igual que _Cell.text: un párrafo por línea
+    return "\n".join(_p_text(p) for p in _XP_P(tc))
+
+def _table_rows(tbl) -> Table:
+    """
+    Igual que [[c.text for c in r.cells] for r in t.rows]: una celda con gridSpan
+    se repite por cada columna que abarca y una continuación de combinación
+    vertical (w:vMerge sin val="restart") toma el texto de la celda de arriba.
+    """
+    rows = []
+    above: Dict[int, str] = {}  # columna de inicio -> texto, de la fila anterior
+    for tr in _XP_TR(tbl):
+        row, here = [], {}
+        grid_before = _XP_GRID_BEFORE(tr)
+        col = int(grid_before[0]) if grid_before else 0
+        for tc in _XP_TC(tr):
+            grid_span = _XP_GRID_SPAN(tc)
+            span = int(grid_span[0]) if grid_span else 1
+            vmerge = _XP_VMERGE(tc)
+            if vmerge and vmerge[0].get(_W + "val", "continue") == "continue":
+                text = above.get(col, "")
+            else:
+                text = _cell_text(tc)
+            here[col] = text
+            row.extend([text] * span)
+            col += span
+        rows.append(row)
+        above = here
+    return rows
+
+def iter_blocks(path: str) -> Iterator[Tuple[str, Union[str, Table]]]:
+    """
+    Recorre en streaming el cuerpo del documento y entrega, en orden,
+    ("p", texto) por cada párrafo y ("tbl", filas) por cada tabla.
+    """
+    with zipfile.ZipFile(path) as z, z.open("word/document.xml") as f:
+        for _, el in etree.iterparse(f, events=("end",), tag=(_W_P, _W_TBL), resolve_entities=False):
+            parent = el.getparent()
+            if parent is None or parent.tag != _W_BODY:
+                continue  # párrafos/tablas dentro de celdas: se leen con su tabla
+            if el.tag == _W_P:
+                yield "p", _p_text(el)
+            else:
+                yield "tbl", _table_rows(el)
+            # Libera lo ya procesado para que la memoria no crezca con el documento
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+
 # ---------------- Extractores ----------------
-def extract_eh_code(doc: Document) -> str:
-    pat = re.compile(r'\bEH-[A-Z0-9]{2,}-\d{5}\b', re.IGNORECASE)
-    for p in doc.paragraphs:
-        m = pat.search(p.text)
-        if m: return m.group(0).upper()
-    for t in doc.tables:
-        for r in t.rows:
-            for c in r.cells:
-                m = pat.search(c.text)
-                if m: return m.group(0).upper()
-    return ""
-
-def extract_fecha_version(doc: Document) -> str:
-    for t in doc.tables:
-        for r in t.rows:
-            if len(r.cells) < 2: continue
-            if "fecha de la version" in _norm(r.cells[0].text):
-                return parse_spanish_date(r.cells[1].text)
-    for p in doc.paragraphs:
-        if "fecha" in _norm(p.text):
-            parsed = parse_spanish_date(p.text)
-            if parsed: return parsed
-    return ""
-
-def _is_resume_table(t) -> bool:
-    if t.rows:
-        header = " | ".join(_norm(c.text) for c in t.rows[0].cells)
-        return "severidad" in header and ("cvss" in header or "vulnerabilidad" in header)
+LABELS = {"punto de entrada":"num","metodo":"metodo","método":"metodo","uri":"uri"}
+_LABEL_FIRST_CHARS = frozenset(k[0] for k in LABELS)
+_LABEL_LENGTHS = frozenset(len(k) for k in LABELS)
+
+def _maybe_label(raw: str) -> bool:
+    """Descarte barato antes de _norm: en ASCII, _norm solo hace strip + lower."""
+    s = raw.strip()
+    if not s.isascii(): return True  # acentos/nbsp internos: decide _norm
+    return s[:1].lower() in _LABEL_FIRST_CHARS and len(s) in _LABEL_LENGTHS
+
+def _search_eh(text: str) -> str:
+    # Prefiltro con búsquedas de subcadena (en C) antes de invocar el regex
+    if "-" not in text or "EH-" not in text.upper(): return ""
+    m = _EH_RE.search(text)
+    return m.group(0).upper() if m else ""
+
+def _is_resume_table(header: List[str]) -> bool:
+    """Tabla resumen: encabezado con "severidad" y con "cvss" o "vulnerabilidad"."""
+    has_sev = has_cvss_or_vuln = False
+    for c in header:
+        n = _norm(c)
+        if "severidad" in n: has_sev = True
+        if "cvss" in n or "vulnerabilidad" in n: has_cvss_or_vuln = True
+        if has_sev and has_cvss_or_vuln: return True
     return False
 
-def count_vulnerabilities_by_severity(doc: Document) -> Dict[str,int]:
+def scan_document(path: str) -> Tuple[str, str, Dict[str,int], List[Tuple[str,str,str]]]:
+    """
+    Recorre una sola vez párrafos y tablas del .docx y devuelve (eh, fecha, conteos, endpoints).
+    Prioridades: EH en párrafos antes que en tablas; fecha de la tabla
+    ("Fecha de la versión") antes que la de los párrafos.
+    """
+    eh_par = eh_tbl = ""
+    fecha_par = ""
+    fecha_tbl: Optional[str] = None
     counts = {"CRITICA":0, "ALTA":0, "MEDIA":0, "BAJA":0}
-    for t in doc.tables:
-        if not _is_resume_table(t): continue
-        for row in t.rows[1:]:
-            if not row.cells: continue
-            sev = _clean(row.cells[-1].text).upper().replace("Í","I")
-            for key in counts.keys():
-                if key in sev:
-                    counts[key] += 1
-                    break
-    return counts
-
-def extract_endpoints(doc: Document) -> List[Tuple[str,str,str]]:
-    LABELS = {"punto de entrada":"num","metodo":"metodo","método":"metodo","uri":"uri"}
     rows = []
-    for t in doc.tables:
+
+    for kind, block in iter_blocks(path):
+        if kind == "p":
+            if not eh_par:
+                eh_par = _search_eh(block)
+            # La fecha de tabla tiene prioridad: si ya apareció, no se buscan más en párrafos.
+            # Antes de _norm + regex, un filtro de subcadena sobre el texto crudo.
+            if (fecha_tbl is None and not fecha_par and ("echa" in block or "ECHA" in block)
+                    and "fecha" in _norm(block)):
+                fecha_par = parse_spanish_date(block)
+            continue
+        t = block
+        if not t: continue
+        resume = _is_resume_table(t[0])
         data = {"num":"","metodo":"","uri":""}
-        for r in t.rows:
-            if len(r.cells) < 2: continue
-            key = _norm(r.cells[0].text)
-            if key in LABELS:
-                val = _clean(r.cells[1].text)
-                if LABELS[key] == "uri":
+        for i, r in enumerate(t):
+            if not r: continue
+            if not eh_tbl:
+                for c in r:
+                    eh_tbl = _search_eh(c)
+                    if eh_tbl: break
+            if resume and i > 0:
+                m = _SEV_RE.search(r[-1].upper())
+                if m: counts[m.group(0).replace("Í","I")] += 1
+            if len(r) < 2: continue
+            first = r[0]
+            if fecha_tbl is None and "fecha de la version" in _norm(first):
+                fecha_tbl = parse_spanish_date(r[1])
+            if not _maybe_label(first): continue
+            label = _norm(first)
+            if label in LABELS:
+                val = _clean(r[1])
+                if LABELS[label] == "uri":
                     val = val.replace(" ", "")  # 🔥 limpia espacios en URLs
-                data[LABELS[key]] = val
+                data[LABELS[label]] = val
         if data["num"] and data["metodo"] and data["uri"]:
-            metodo = data["metodo"].split()[0].upper()
+            # Primer token sin crear la lista de split(); _clean ya dejó un solo espacio
+            metodo = data["metodo"]
+            i = metodo.find(" ")
+            metodo = (metodo[:i] if i >= 0 else metodo).upper()
             if metodo in HTTP_METHODS:
                 rows.append((data["num"], metodo, data["uri"]))
-    def sort_key(r):
-        try: return int(re.sub(r"\D","", r[0]))
-        except: return r[0]
-    rows.sort(key=sort_key)
-    return rows
+
+    # Orden por número de punto de entrada; la clave se calcula una vez por fila
+    keyed = [(int(_NONDIGIT_RE.sub("", r[0]) or "0"), r) for r in rows]
+    keyed.sort(key=lambda x: x[0])
+    rows = [r for _, r in keyed]
+
+    eh = eh_par or eh_tbl
+    fecha = fecha_tbl if fecha_tbl is not None else fecha_par
+    return eh, fecha, counts, rows
 
 # ---------------- Main ----------------
 def main():
@@ -129,20 +256,26 @@ def main():
     ap.add_argument("--json", help="Ruta del JSON de salida")
     args = ap.parse_args()
 
-    doc = Document(args.docx)
-    eh = extract_eh_code(doc)
-    fecha = extract_fecha_version(doc)
-    counts = count_vulnerabilities_by_severity(doc)
-    endpoints = extract_endpoints(doc)
+    eh, fecha, counts, endpoints = scan_document(args.docx)
 
     if args.csv:
         with open(args.csv, "w", newline="", encoding="utf-8") as f:
             w = csv.writer(f, delimiter=";")
+            # Plantilla única: por endpoint solo cambian las 3 primeras columnas
+            tmpl = ["", "", "", eh, fecha, counts["CRITICA"], counts["ALTA"], counts["MEDIA"], counts["BAJA"]]
             for num, metodo, uri in endpoints:
-                w.writerow([num, metodo, uri, eh, fecha, counts["CRITICA"], counts["ALTA"], counts["MEDIA"], counts["BAJA"]])
+                tmpl[0] = num; tmpl[1] = metodo; tmpl[2] = uri
+                w.writerow(tmpl)
         print(f"CSV generado: {args.csv}")
 
     if args.json:
+        # Los conteos son por documento: un único dict compartido por todos los registros
+        vuln = {
+            "criticas": counts["CRITICA"],
+            "altas": counts["ALTA"],
+            "medias": counts["MEDIA"],
+            "bajas": counts["BAJA"]
+        }
         data = []
         for num, metodo, uri in endpoints:
             data.append({
@@ -151,15 +284,14 @@ def main():
                 "uri": uri,
                 "eh_code": eh,
                 "fecha_ejec": fecha,
-                "vulnerabilidades": {
-                    "criticas": counts["CRITICA"],
-                    "altas": counts["ALTA"],
-                    "medias": counts["MEDIA"],
-                    "bajas": counts["BAJA"]
-                }
+                "vulnerabilidades": vuln
             })
+        # Modo texto en ambos casos: mismos fin de línea (CRLF en Windows) con o sin orjson
         with open(args.json, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+            else:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"JSON generado: {args.json}")
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@
 
 #  Ejecución:
 # python convert-pdf-to-docx_v-fileEH.py "C:\Users\user\Downloads\test\sssssssssssssss.pdf"
+# python convert-pdf-to-docx_v-fileEH.py --batch "C:\Users\user\Downloads\test" --workers 4
 # Esta versión convierte un PDF a word.
 # 
 #
@@ -14,10 +15,22 @@
 
 
 import argparse
+import glob
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Optional
 
+# Import único por proceso (también en cada worker de --batch); si falta,
+# el error se informa al convertir para que --help siga funcionando.
+try:
+    from pdf2docx import Converter
+except ImportError:
+    Converter = None
+
+# Máximo de procesos de ProcessPoolExecutor en Windows (límite de WaitForMultipleObjects)
+_WIN32_MAX_WORKERS = 61
+
 # -----------------------------
 # Capa de utilidades (helpers)
 # -----------------------------
@@ -53,6 +66,27 @@ def default_output_path(input_pdf: str) -> str:
     return base + ".docx"
 
 
+def batch_output_path(input_pdf: str, out_dir: Optional[str]) -> str:
+    """
+    En modo --batch: mismo nombre que el PDF, dentro de out_dir si se indicó
+    o junto al PDF en caso contrario.
+    """
+    if not out_dir:
+        return default_output_path(input_pdf)
+    name = os.path.splitext(os.path.basename(input_pdf))[0] + ".docx"
+    return os.path.join(out_dir, name)
+
+
+def collect_pdfs(spec: str) -> List[str]:
+    """
+    Si spec es un directorio devuelve sus PDF; si no, lo usa como patrón glob.
+    """
+    pattern = os.path.join(spec, "*") if os.path.isdir(spec) else spec
+    return sorted(
+        os.path.abspath(p) for p in glob.glob(pattern) if p.lower().endswith(".pdf")
+    )
+
+
 def ensure_readable_file(path: str) -> None:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"No se encontró el archivo: {path}")
@@ -81,9 +115,7 @@ def convert_with_pdf2docx(
     """
     Convierte con pdf2docx. Si page_ranges es None, convierte todo el documento.
     """
-    try:
-        from pdf2docx import Converter
-    except ImportError:
+    if Converter is None:
         raise RuntimeError(
             "No se encontró 'pdf2docx'. Instálalo con:  pip install pdf2docx"
         )
@@ -95,21 +127,31 @@ def convert_with_pdf2docx(
             # Documento completo
             cv.convert(output_docx)
         else:
-            # Convertir por rangos (1-based inclusive)
-            # pdf2docx usa 0-based y end exclusive, así que ajustamos
+            # Rangos 1-based inclusive -> índices 0-based de pdf2docx.
+            # Una sola conversión con todas las páginas: llamar a convert() por rango
+            # sobrescribía el DOCX y dejaba solo el último rango.
+            pages = sorted({p for start, end in page_ranges for p in range(start - 1, end)})
             for i, (start, end) in enumerate(page_ranges, start=1):
                 print(f"  → Rango {i}: páginas {start}-{end}")
-                cv.convert(
-                    output_docx,
-                    start=start - 1,
-                    end=end,  # end ya funciona como exclusivo al usar entero 0-based
-                    # layout_kwargs podría afinar el reconocimiento, pero lo dejamos simple y estable
-                )
+            cv.convert(output_docx, pages=pages)
     finally:
         cv.close()
     print(f"✅ Listo: {output_docx}")
 
 
+def _convert_one(task: Tuple[str, str, Optional[List[Tuple[int, int]]]]) -> Optional[str]:
+    """
+    Tarea del pool de procesos: convierte un PDF y devuelve el mensaje de error
+    (None si terminó bien), para que un fallo no detenga el resto del lote.
+    """
+    input_pdf, output_docx, page_ranges = task
+    try:
+        convert_with_pdf2docx(input_pdf, output_docx, page_ranges)
+    except Exception as ex:
+        return f"{input_pdf}: {ex}"
+    return None
+
+
 # --------------------------------
 # Capa de orquestación (CLI)
 # --------------------------------
@@ -118,12 +160,26 @@ def build_arg_parser() -> argparse.ArgumentParser:
         prog="pdf_a_word.py",
         description="Convierte un PDF a Word (DOCX) preservando formato (similar a iLovePDF).",
     )
-    p.add_argument("input_pdf", help="Ruta al archivo PDF de entrada")
+    p.add_argument("input_pdf", nargs="?", help="Ruta al archivo PDF de entrada")
     p.add_argument(
         "-o",
         "--output",
         dest="output_docx",
-        help="Ruta al DOCX de salida (opcional). Por defecto, mismo nombre que el PDF.",
+        help=(
+            "Ruta al DOCX de salida (opcional). Por defecto, mismo nombre que el PDF. "
+            "Con --batch, directorio de salida."
+        ),
+    )
+    p.add_argument(
+        "--batch",
+        dest="batch",
+        help='Directorio o patrón glob de PDFs a convertir en paralelo, ej. "C:/pdfs/*.pdf".',
+    )
+    p.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        help="Procesos en paralelo para --batch. Por defecto, número de CPUs.",
     )
     p.add_argument(
         "--pages",
@@ -138,9 +194,56 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return p
 
 
+def main_batch(args: argparse.Namespace) -> int:
+    """
+    Convierte en paralelo (un proceso por PDF) todos los archivos de --batch.
+    """
+    try:
+        page_ranges = parse_page_ranges(args.pages)
+        pdfs = collect_pdfs(args.batch)
+        if not pdfs:
+            raise FileNotFoundError(f"No se encontraron PDF en: {args.batch}")
+        out_dir = os.path.abspath(args.output_docx) if args.output_docx else None
+        tasks = []
+        sources = {}  # DOCX de salida (normcase) -> PDF que lo genera
+        for input_pdf in pdfs:
+            output_docx = batch_output_path(input_pdf, out_dir)
+            ensure_readable_file(input_pdf)
+            ensure_writable_path(output_docx, overwrite=args.overwrite)
+            key = os.path.normcase(output_docx)
+            if key in sources:
+                raise ValueError(
+                    f"{sources[key]} y {input_pdf} generarían el mismo archivo: {output_docx}"
+                )
+            sources[key] = input_pdf
+            tasks.append((input_pdf, output_docx, page_ranges))
+    except Exception as ex:
+        print(f"❌ Error: {ex}")
+        return 1
+
+    # No más procesos que PDFs; en Windows ProcessPoolExecutor no admite más de 61
+    # (ValueError), límite que la stdlib solo aplica cuando max_workers es None.
+    workers = min(args.workers or os.cpu_count() or 1, len(tasks))
+    if sys.platform == "win32":
+        workers = min(workers, _WIN32_MAX_WORKERS)
+    print(f"📚 Convirtiendo {len(tasks)} PDF con {workers} proceso(s)...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        errors = [err for err in pool.map(_convert_one, tasks) if err]
+
+    for err in errors:
+        print(f"❌ Error: {err}")
+    return 1 if errors else 0
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
+    if bool(args.input_pdf) == bool(args.batch):
+        parser.error("Indica un PDF de entrada o --batch (uno de los dos).")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers debe ser >= 1.")
+    if args.batch:
+        return main_batch(args)
 
     input_pdf = os.path.abspath(args.input_pdf)
     output_docx = (